@@ -28,6 +28,7 @@ def apply_LG_plus(
     chooseholes,
     affine2d,
     run_bpfix,
+    max_cores="none",
 ):
     """
     Applies the image plane algorithm to an AMI image
@@ -58,6 +59,9 @@ def apply_LG_plus(
         None or user-defined Affine2d object
     run_bpfix : boolean
         Run Fourier bad pixel fix on cropped data
+    max_cores : string
+        Number of cores to use for the bad pixel fix: 'none', 'quarter',
+        'half' or 'all' of the available cores
 
     Returns
     -------
@@ -181,7 +185,8 @@ def apply_LG_plus(
                                     firstfew=firstfew,
                                     usebp=usebp,
                                     chooseholes=chooseholes,
-                                    run_bpfix=run_bpfix)
+                                    run_bpfix=run_bpfix,
+                                    max_cores=max_cores)
 
     ff_t = nrm_core.FringeFitter(niriss,
                                  psf_offset_ff=psf_offset_ff,
@@ -22,6 +22,7 @@ class AmiAnalyzeStep(Step):
         chooseholes = string(default=None) # If not None, fit only certain fringes e.g. ['B4','B5','B6','C2']
         affine2d = any(default=None) # None or user-defined Affine2d object
         run_bpfix = boolean(default=True) # Run Fourier bad pixel fix on cropped data
+        maximum_cores = option('none', 'quarter', 'half', 'all', default='none') # Number of cores for the bad pixel fix
     """
 
     reference_file_types = ['throughput', 'nrm']
@@ -59,6 +60,7 @@ class AmiAnalyzeStep(Step):
         chooseholes = self.chooseholes
         affine2d = self.affine2d
         run_bpfix = self.run_bpfix
+        max_cores = self.maximum_cores
 
         # pull out parameters that are strings and change to floats
         psf_offset = [float(a) for a in self.psf_offset.split()]
@@ -106,6 +108,7 @@ class AmiAnalyzeStep(Step):
                     chooseholes,
                     affine2d,
                     run_bpfix,
+                    max_cores,
                 )
 
         amilgmodel.meta.cal_step.ami_analyze = 'COMPLETE'
@@ -1,8 +1,10 @@
+import cv2
 import numpy as np
 import logging
+import multiprocessing
 
-from copy import deepcopy
-from poppy import matrixDFT
+from functools import lru_cache
+from scipy.linalg import cho_factor, cho_solve
 from scipy.ndimage import median_filter
 
 from stdatamodels.jwst.datamodels import dqflags
@@ -42,6 +44,16 @@ PUPLDIAM = 6.603464  # / Full pupil file size, incl padding.
 PUPL_CRC = 6.603464  # / Circumscribing diameter for JWST primary
 
 
+@lru_cache(maxsize=None)
+def _get_mft():
+    """Return the matrix DFT object shared by all transforms."""
+    # poppy imports matplotlib.pyplot, which is slow; only import it
+    # when the bad pixel correction is actually run.
+    from poppy import matrixDFT
+
+    return matrixDFT.MatrixFourierTransform()
+
+
 def create_wavelengths(filtername):
     """
     Extend filter support slightly past half power points.
@@ -98,6 +110,91 @@ def calc_pupil_support(filtername, sqfov_npix, pxsc_rad, pupil_mask):
     return transform_image(detimage)
 
 
+def calc_fourier_mask(filtername, sqfov_npix, pxsc_rad, pupil_mask):
+    """
+    Calculate the Fourier mask (the complement of the pupil support)
+    and return it in the layout of `numpy.fft.rfft2`, so that it can be
+    applied to the half-plane transform of the real-valued science data.
+
+    Parameters
+    ----------
+    filtername: string
+        AMI filter name
+
+    sqfov_npix: int
+        Square field of view in number of pixels
+
+    pxsc_rad: float
+        Detector pixel scale in rad/px
+
+    pupil_mask: array
+        Pupil mask model (NRM)
+
+    Returns
+    -------
+    fmas: bool array
+        Fourier mask of shape (sqfov_npix, sqfov_npix // 2 + 1), True
+        outside the pupil support.
+    """
+    cvis = calc_pupil_support(filtername, sqfov_npix, pxsc_rad, pupil_mask)
+    cvis /= np.max(cvis)
+    fmas = cvis < 1e-3  # 1e-3 seems to be a reasonable threshold
+
+    # The support is computed with the zero frequency at the center; move it
+    # to the origin and keep only the non-negative frequencies along the
+    # last axis (the Nyquist column wraps around to the first column).
+    cols = (np.arange(sqfov_npix // 2 + 1) + sqfov_npix // 2) % sqfov_npix
+    return np.fft.ifftshift(fmas, axes=0)[:, cols]
+
+
+# Fourier masks of recently used NRM reference files, see _get_fourier_mask
+_FOURIER_MASKS = {}
+_FOURIER_MASKS_MAXSIZE = 4
+
+
+def _get_fourier_mask(filtername, sqfov_npix, pxsc_rad, nrm_model):
+    """
+    Return the Fourier mask for an NRM reference model, reusing the one
+    computed for an earlier exposure with the same reference file.
+
+    The mask only depends on the filter, the field of view, the pixel scale
+    and the pupil, so it is cached on the reference file name rather than
+    on the pupil array itself. Models without a file name are not cached.
+
+    Parameters
+    ----------
+    filtername: string
+        AMI filter name
+    sqfov_npix: int
+        Square field of view in number of pixels
+    pxsc_rad: float
+        Detector pixel scale in rad/px
+    nrm_model: datamodel object
+        NRM pupil datamodel
+
+    Returns
+    -------
+    fmas: bool array
+        Read-only Fourier mask in `numpy.fft.rfft2` layout
+    """
+    meta = getattr(nrm_model, "meta", None)
+    filename = getattr(meta, "filename", None)
+    if filename is None:
+        return calc_fourier_mask(filtername, sqfov_npix, pxsc_rad, nrm_model.nrm)
+
+    key = (filename, filtername, sqfov_npix, pxsc_rad)
+    fmas = _FOURIER_MASKS.get(key)
+    if fmas is None:
+        fmas = calc_fourier_mask(filtername, sqfov_npix, pxsc_rad, nrm_model.nrm)
+        # The cached mask is shared between callers.
+        fmas.flags.writeable = False
+        if len(_FOURIER_MASKS) >= _FOURIER_MASKS_MAXSIZE:
+            # Drop the oldest entry
+            del _FOURIER_MASKS[next(iter(_FOURIER_MASKS))]
+        _FOURIER_MASKS[key] = fmas
+    return fmas
+
+
 def transform_image(image):
     """
     Take Fourier transform of image
@@ -112,8 +209,7 @@ def transform_image(image):
     Absolute value of FT(image)
 
     """
-    ft = matrixDFT.MatrixFourierTransform()
-    ftimage = ft.perform(
+    ftimage = _get_mft().perform(
         image, image.shape[0], image.shape[0]
     )  # fake the no-loss fft w/ dft
 
@@ -145,15 +241,39 @@ def calcpsf(wl, fovnpix, pxsc_rad, pupil_mask):
     """
     reselt = wl / PUPLDIAM  # radian
     nlamD = fovnpix * pxsc_rad / reselt  # Soummer nlamD FOV in reselts
-    # instantiate an mft object:
-    ft = matrixDFT.MatrixFourierTransform()
-
-    image_field = ft.perform(pupil_mask, nlamD, fovnpix)
+    image_field = _get_mft().perform(pupil_mask, nlamD, fovnpix)
     image_intensity = (image_field * image_field.conj()).real
 
     return image_intensity
 
 
+def _median_filter(data, size):
+    """
+    Median filter a 2D image with a square kernel.
+
+    OpenCV's median blur is much faster than `scipy.ndimage.median_filter`
+    for the 3x3 kernel used by `fix_bad_pixels`. OpenCV replicates the
+    border, which only matches the scipy default for a 3x3 kernel, so
+    other sizes use scipy.
+
+    Parameters
+    ----------
+    data: numpy array
+        2D image
+    size: int
+        Median filter size (pixels)
+
+    Returns
+    -------
+    mfil_data: numpy array
+        Median filtered image
+    """
+    if size == 3:
+        mfil_data = cv2.medianBlur(np.ascontiguousarray(data, dtype=np.float32), size)
+        return mfil_data.astype(data.dtype, copy=False)
+    return median_filter(data, size=size)
+
+
 def bad_pixels(data, median_size, median_tres):
     """
     Identify bad pixels by subtracting median-filtered data and searching for
@@ -174,21 +294,22 @@ def bad_pixels(data, median_size, median_tres):
         Bad pixel mask identified by median filtering
     """
 
-    mfil_data = median_filter(data, size=median_size)
+    mfil_data = _median_filter(data, median_size)
     diff_data = np.abs(data - mfil_data)
     pxdq = diff_data > median_tres * np.median(diff_data)
     pxdq = pxdq.astype("int")
 
+    nbad = np.sum(pxdq)
     log.info(
-        "         Identified %.0f bad pixels (%.2f%%)"
-        % (np.sum(pxdq), np.sum(pxdq) / np.prod(pxdq.shape) * 100.0)
+        "         Identified %.0f bad pixels (%.2f%%)",
+        nbad, nbad / pxdq.size * 100.0,
     )
-    log.info("         %.3f" % np.max(diff_data / np.median(diff_data)))
+    log.info("         %.3f", np.max(diff_data) / np.median(diff_data))
 
     return pxdq
 
 
-def fourier_corr(data, pxdq, fmas):
+def fourier_corr(data, pxdq, fmas, cache=None):
     """
     Compute and apply the bad pixel corrections based on Section 2.5 of
     Ireland 2013.
@@ -199,8 +320,13 @@ def fourier_corr(data, pxdq, fmas):
         Science data
     pxdq: numpy array
         Bad pixel mask
-    fmas:
-        FT of science data
+    fmas: bool array
+        Fourier mask in `numpy.fft.rfft2` layout, True outside the
+        pupil support
+    cache: dict, optional
+        If given, holds the pseudo inverse of B_Z for the most recent
+        bad pixel mask, so that correcting the same pixels again does
+        not recompute it
 
     Returns
     -------
@@ -217,41 +343,155 @@ def fourier_corr(data, pxdq, fmas):
 
     # Get the dimensions.
     ww = np.where(pxdq > 0.5)
+    if ww[0].size == 0:
+        # Nothing to correct.
+        return data.copy()
     ww_ft = np.where(fmas)
 
+    B_Z_mppinv = _get_corrector(ww, ww_ft, data.shape, cache)
+
+    return _apply_corrector(data, ww, ww_ft, B_Z_mppinv)
+
+
+def _get_corrector(ww, ww_ft, shape, cache=None):
+    """
+    Return the pseudo inverse of B_Z for a given set of bad pixels and
+    Fourier mask, reusing the one in `cache` if it was computed for the
+    same pixels.
+
+    After the iterative search has converged, the same bad pixel map is
+    corrected once more on the original data, so keeping the most recent
+    matrix avoids recomputing the expensive matrix build and solve.
+
+    Parameters
+    ----------
+    ww: tuple of int arrays
+        Indices of the bad pixels
+    ww_ft: tuple of int arrays
+        Indices of the Fourier domain Z
+    shape: tuple of int
+        Shape of the science data
+    cache: dict, optional
+        Holds the most recent pseudo inverse of B_Z, keyed on the
+        pixel and frequency indices
+
+    Returns
+    -------
+    B_Z_mppinv: numpy array
+        Moore-Penrose pseudo inverse of B_Z
+    """
+    if cache is None:
+        return _build_corrector(ww, ww_ft, shape)
+
+    key = (
+        tuple(w.tobytes() for w in ww),
+        tuple(w.tobytes() for w in ww_ft),
+        tuple(shape),
+    )
+    B_Z_mppinv = cache.get(key)
+    if B_Z_mppinv is None:
+        B_Z_mppinv = _build_corrector(ww, ww_ft, shape)
+        # Only the latest matrix is ever reused; drop the older ones.
+        cache.clear()
+        cache[key] = B_Z_mppinv
+    return B_Z_mppinv
+
+
+def _build_corrector(ww, ww_ft, shape):
+    """
+    Compute the Moore-Penrose pseudo inverse of the B_Z matrix from
+    Section 2.5 of Ireland 2013.
+
+    Parameters
+    ----------
+    ww: tuple of int arrays
+        Indices of the bad pixels
+    ww_ft: tuple of int arrays
+        Indices of the Fourier domain Z
+    shape: tuple of int
+        Shape of the science data
+
+    Returns
+    -------
+    B_Z_mppinv: numpy array
+        Moore-Penrose pseudo inverse of B_Z
+    """
     # Compute the B_Z matrix from Section 2.5 of Ireland 2013. This matrix
     # maps the bad pixels onto their Fourier power in the domain Z, which is
     # the complement of the pupil support.
-    B_Z = np.zeros((len(ww[0]), len(ww_ft[0]) * 2))
-    xh = data.shape[0] // 2
-    yh = data.shape[1] // 2
+    xh = shape[0] // 2
+    yh = shape[1] // 2
     xx, yy = np.meshgrid(
-        2.0 * np.pi * np.arange(yh + 1) / data.shape[1],
+        2.0 * np.pi * np.arange(yh + 1) / shape[1],
         2.0
         * np.pi
-        * (((np.arange(data.shape[0]) + xh) % data.shape[0]) - xh)
-        / data.shape[0],
+        * (((np.arange(shape[0]) + xh) % shape[0]) - xh)
+        / shape[0],
     )
-    for i in range(len(ww[0])):
-        cdft = np.exp(-1j * (ww[0][i] * yy + ww[1][i] * xx))
-        B_Z[i, :] = np.append(cdft[ww_ft].real, cdft[ww_ft].imag)
+    # Only the frequencies in Z are needed, so evaluate the complex
+    # exponentials for all bad pixels at once on those frequencies.
+    kx = xx[ww_ft]
+    ky = yy[ww_ft]
+    phase = np.multiply.outer(ww[0], ky)
+    phase += np.multiply.outer(ww[1], kx)
+    cdft = np.exp(-1j * phase)
+
+    nft = len(ww_ft[0])
+    B_Z = np.empty((len(ww[0]), 2 * nft))
+    B_Z[:, :nft] = cdft.real
+    B_Z[:, nft:] = cdft.imag
+
+    # Compute the Moore-Penrose pseudo inverse of B_Z (Equation 19 of
+    # Ireland 2013). B_Z is real, so B_Z B_Z^* is symmetric positive
+    # definite and can be solved with a Cholesky factorization instead
+    # of being inverted explicitly. Taking the transpose of B_Z as a view
+    # (rather than the conjugate copy) lets numpy compute the symmetric
+    # product with a single rank-k update.
+    gram = np.dot(B_Z, B_Z.T)
+    try:
+        factor = cho_factor(gram, check_finite=False)
+    except np.linalg.LinAlgError:
+        B_Z_mppinv = np.linalg.solve(gram, B_Z).T
+    else:
+        B_Z_mppinv = cho_solve(factor, B_Z, overwrite_b=True, check_finite=False).T
+
+    return B_Z_mppinv
+
+
+def _apply_corrector(data, ww, ww_ft, B_Z_mppinv):
+    """
+    Apply the bad pixel corrections given the pseudo inverse of B_Z.
 
-    # Compute the corrections for the bad pixels using the Moore-Penrose pseudo
-    # inverse of B_Z (Equation 19 of Ireland 2013).
-    B_Z_ct = np.transpose(np.conj(B_Z))
-    B_Z_mppinv = np.dot(B_Z_ct, np.linalg.inv(np.dot(B_Z, B_Z_ct)))
+    Parameters
+    ----------
+    data: numpy array
+        Science data
+    ww: tuple of int arrays
+        Indices of the bad pixels
+    ww_ft: tuple of int arrays
+        Indices of the Fourier domain Z
+    B_Z_mppinv: numpy array
+        Moore-Penrose pseudo inverse of B_Z
 
-    # Apply the corrections for the bad pixels.
-    data_out = deepcopy(data)
+    Returns
+    -------
+    data_out: numpy array
+        Corrected science data
+    """
+    data_out = data.copy()
     data_out[ww] = 0.0
     data_ft = np.fft.rfft2(data_out)[ww_ft]
-    corr = -np.real(np.dot(np.append(data_ft.real, data_ft.imag), B_Z_mppinv))
+    nft = data_ft.size
+    data_ft_vec = np.empty(2 * nft)
+    data_ft_vec[:nft] = data_ft.real
+    data_ft_vec[nft:] = data_ft.imag
+    corr = -np.dot(data_ft_vec, B_Z_mppinv)
     data_out[ww] += corr
 
     return data_out
 
 
-def fix_bad_pixels(data, pxdq0, filt, pxsc, nrm_model):
+def fix_bad_pixels(data, pxdq0, filt, pxsc, nrm_model, max_cores="none"):
     """
     Apply the Fourier bad pixel correction to pixels
     flagged DO_NOT_USE or JUMP_DET.
@@ -269,6 +509,13 @@ def fix_bad_pixels(data, pxdq0, filt, pxsc, nrm_model):
         Pixel scale, mas/pixel
     nrm_model: datamodel object
         NRM pupil datamodel
+    max_cores: string
+        Number of cores to use for correcting the frames in parallel. If
+        set to 'none' (the default), then no multiprocessing will be done.
+        The other allowable values are 'quarter', 'half', and 'all', which
+        indicate the fraction of cores to use. The per-frame and
+        per-iteration log messages are not shown when multiprocessing,
+        since the worker processes have no logging configured.
 
     Returns
     -------
@@ -280,23 +527,24 @@ def fix_bad_pixels(data, pxdq0, filt, pxsc, nrm_model):
     """
     DO_NOT_USE = dqflags.pixel["DO_NOT_USE"]
     JUMP_DET = dqflags.pixel["JUMP_DET"]
+
+    # DNU, some other pixels are now NaNs in cal level products.
+    # Replace them with 0, then
+    # add DO_NOT_USE flags to positions in DQ array so they will be corrected.
+    nanmask = np.isnan(data)
+    nan_count = np.count_nonzero(nanmask)
+    if nan_count:
+        log.info("Identified %i NaN pixels to correct", nan_count)
+        data[nanmask] = 0
+        pxdq0[nanmask] |= DO_NOT_USE  # add DNU flag to each nan pixel
+
     dq_dnu = pxdq0 & DO_NOT_USE == DO_NOT_USE
     dq_jump = pxdq0 & JUMP_DET == JUMP_DET
     dqmask = dq_dnu | dq_jump
 
     pxdq = np.where(dqmask, pxdq0, 0)
     nflagged_dnu = np.count_nonzero(pxdq)
-    log.info("%i pixels flagged DO_NOT_USE in cropped data" % nflagged_dnu)
-
-    # DNU, some other pixels are now NaNs in cal level products.
-    # Replace them with 0, then
-    # add DO_NOT_USE flags to positions in DQ array so they will be corrected.
-    nanidxlist = np.argwhere(np.isnan(data))
-    if len(nanidxlist) > 1:
-        log.info("Identified %i NaN pixels to correct" % len(nanidxlist))
-        for idx in nanidxlist:
-            data[idx[0], idx[1], idx[2]] = 0
-            pxdq0[idx[0], idx[1], idx[2]] += 1  # add DNU flag to each nan pixel
+    log.info("%i pixels flagged DO_NOT_USE in cropped data", nflagged_dnu)
 
     # These values are taken from the JDox and the SVO Filter Profile
     # Service.
@@ -310,85 +558,144 @@ def fix_bad_pixels(data, pxdq0, filt, pxsc, nrm_model):
     median_size = 3  # pix
     median_tres = 50.0  # JK: changed from 28 to 20 in order to capture all bad pixels
 
-    pupil_mask = nrm_model.nrm
     imsz = data.shape
     sh = imsz[-1] // 2  # half size, even
     # Compute field-of-view and Fourier sampling.
     fov = 2 * sh * pxsc / 1000.0  # arcsec
     fsam = filtwl_d[filt] / (fov / 3600.0 / 180.0 * np.pi)  # m/pix
-    log.info("      FOV = %.1f arcsec, Fourier sampling = %.3f m/pix" % (fov, fsam))
+    log.info("      FOV = %.1f arcsec, Fourier sampling = %.3f m/pix", fov, fsam)
 
     #
-    cvis = calc_pupil_support(filt, 2 * sh, pxsc_rad, pupil_mask)
-    cvis /= np.max(cvis)
-    fmas = cvis < 1e-3  # 1e-3 seems to be a reasonable threshold
-    fmas = np.fft.fftshift(fmas)[:, : 2 * sh // 2 + 1]
+    fmas = _get_fourier_mask(filt, 2 * sh, pxsc_rad, nrm_model)
 
     # Compute the pupil mask. This mask defines the region where we are
     # measuring the noise. It looks like 15 lambda/D distance from the PSF
     # is reasonable.
     ramp = np.arange(2 * sh) - 2 * sh // 2
-    xx, yy = np.meshgrid(ramp, ramp)
-    dist = np.sqrt(xx**2 + yy**2)
+    dist = np.hypot.outer(ramp, ramp)
     pmas = (
         dist > 9.0 * filtwl_d[filt] / diam * 180.0 / np.pi * 1000.0 * 3600.0 / pxsc
     )
 
-    # Go through all frames.
-    for j in range(imsz[0]):
-        log.info("         Frame %.0f of %.0f" % (j + 1, imsz[0]))
-
-        # Now cut out the subframe.
-        # no need to cut out sub-frame; data already cropped
-        # odd/even size issues?
-        data_cut = deepcopy(data[j, :-1, :-1])
-        data_orig = deepcopy(data_cut)
-        pxdq_cut = deepcopy(pxdq[j, :-1, :-1])
-        pxdq_cut = pxdq_cut > 0.5
-        # Correct the bad pixels. This is an iterative process. After each
-        # iteration, we check whether new (residual) bad pixels are
-        # identified. If so, we re-compute the corrections. If not, we
-        # terminate the iteration.
-        for k in range(10):
-            # Correct the bad pixels.
-            data_cut = fourier_corr(data_cut, pxdq_cut, fmas)
-            if k == 0:
-                temp = deepcopy(data_cut)
-
-            # Identify residual bad pixels by looking at the high spatial
-            # frequency part of the image.
-            fmas_data = np.real(np.fft.irfft2(np.fft.rfft2(data_cut) * fmas))
-
-            # Analytically determine the noise (Poisson noise + read noise)
-            # and normalize the high spatial frequency part of the image
-            # by it, then identify residual bad pixels.
-            mfil_data = median_filter(data_cut, size=median_size)
-            nois = np.sqrt(mfil_data / gain + rdns**2)
-            fmas_data /= nois
-            temp = bad_pixels(
-                fmas_data, median_size=median_size, median_tres=median_tres
-            )
-
-            # Check which bad pixels are new. Also, compare the
-            # analytically determined noise with the empirically measured
-            # noise.
-            pxdq_new = np.sum(temp[pxdq_cut < 0.5])
-            log.info(
-                "         Iteration %.0f: %.0f new bad pixels, sdev of norm noise = %.3f"
-                % (k + 1, pxdq_new, np.std(fmas_data[pmas]))
-            )
-
-            # If no new bad pixels were identified, terminate the
-            # iteration.
-            if pxdq_new == 0.0:
-                break
-
-            # If new bad pixels were identified, add them to the bad pixel
-            # map.
-            pxdq_cut = ((pxdq_cut > 0.5) | (temp > 0.5)).astype("int")
-
-        # Put the modified frames back into the data cube.
-        data[j, :-1, :-1] = fourier_corr(data_orig, pxdq_cut, fmas)
+    # Determine number of cpu's to use for multi-processing
+    if max_cores == "none":
+        ncpus = 1
+    else:
+        num_cores = multiprocessing.cpu_count()
+        if max_cores == "quarter":
+            ncpus = num_cores // 4 or 1
+        elif max_cores == "half":
+            ncpus = num_cores // 2 or 1
+        elif max_cores == "all":
+            ncpus = num_cores
+        else:
+            ncpus = 1
+        ncpus = min(ncpus, imsz[0])
+        log.debug("Found %i cores; using %i", num_cores, ncpus)
+
+    # Go through all frames. The frames are independent of each other.
+    # Now cut out the subframe.
+    # no need to cut out sub-frame; data already cropped
+    # odd/even size issues?
+    frames = [
+        (j, imsz[0], data[j, :-1, :-1], pxdq[j, :-1, :-1], fmas, pmas,
+         median_size, median_tres, gain, rdns)
+        for j in range(imsz[0])
+    ]
+    if ncpus > 1:
+        ctx = multiprocessing.get_context("forkserver")
+        with ctx.Pool(ncpus) as pool:
+            results = pool.starmap(_fix_frame, frames)
+    else:
+        results = (_fix_frame(*frame) for frame in frames)
+
+    # Put the modified frames back into the data cube.
+    for j, (data_cut, pxdq_cut) in enumerate(results):
+        data[j, :-1, :-1] = data_cut
         pxdq[j, :-1, :-1] = pxdq_cut
 
     return data, pxdq
+
+
+def _fix_frame(j, nframes, data_cut, pxdq_cut, fmas, pmas,
+               median_size, median_tres, gain, rdns):
+    """
+    Iteratively correct the bad pixels of a single frame.
+
+    Parameters
+    ----------
+    j: int
+        Index of the frame, for logging
+    nframes: int
+        Total number of frames, for logging
+    data_cut: numpy array
+        Science data of the frame
+    pxdq_cut: numpy array
+        Bad pixel mask of the frame
+    fmas: bool array
+        Fourier mask in `numpy.fft.rfft2` layout
+    pmas: bool array
+        Mask of the region where the noise is measured
+    median_size: int
+        Median filter size (pixels)
+    median_tres: float
+        Empirically determined threshold
+    gain: float
+        Detector gain (e-/ADU)
+    rdns: float
+        Read noise (e-)
+
+    Returns
+    -------
+    data_cut: numpy array
+        Corrected science data of the frame
+    pxdq_cut: numpy array
+        Bad pixel mask of the frame, updated if new ones were found
+    """
+    log.info("         Frame %.0f of %.0f", j + 1, nframes)
+
+    # fourier_corr does not modify its input, so no copies are needed here.
+    data_orig = data_cut
+    pxdq_cut = pxdq_cut > 0.5
+    corrector_cache = {}
+    # Correct the bad pixels. This is an iterative process. After each
+    # iteration, we check whether new (residual) bad pixels are
+    # identified. If so, we re-compute the corrections. If not, we
+    # terminate the iteration.
+    for k in range(10):
+        # Correct the bad pixels.
+        data_cut = fourier_corr(data_cut, pxdq_cut, fmas, cache=corrector_cache)
+
+        # Identify residual bad pixels by looking at the high spatial
+        # frequency part of the image.
+        fmas_data = np.fft.irfft2(np.fft.rfft2(data_cut) * fmas, s=data_cut.shape)
+
+        # Analytically determine the noise (Poisson noise + read noise)
+        # and normalize the high spatial frequency part of the image
+        # by it, then identify residual bad pixels.
+        mfil_data = _median_filter(data_cut, median_size)
+        nois = np.sqrt(mfil_data / gain + rdns**2)
+        fmas_data /= nois
+        temp = bad_pixels(
+            fmas_data, median_size=median_size, median_tres=median_tres
+        )
+
+        # Check which bad pixels are new. Also, compare the
+        # analytically determined noise with the empirically measured
+        # noise.
+        pxdq_new = np.sum(temp[pxdq_cut < 0.5])
+        log.info(
+            "         Iteration %.0f: %.0f new bad pixels, sdev of norm noise = %.3f",
+            k + 1, pxdq_new, np.std(fmas_data[pmas]),
+        )
+
+        # If no new bad pixels were identified, terminate the
+        # iteration.
+        if pxdq_new == 0.0:
+            break
+
+        # If new bad pixels were identified, add them to the bad pixel
+        # map.
+        pxdq_cut = ((pxdq_cut > 0.5) | (temp > 0.5)).astype("int")
+
+    return fourier_corr(data_orig, pxdq_cut, fmas, cache=corrector_cache), pxdq_cut
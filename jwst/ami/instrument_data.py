@@ -29,7 +29,8 @@ class NIRISS:
                  rotsearch_parameters=None,
                  oversample=None,
                  psf_offset=None,
-                 run_bpfix=True
+                 run_bpfix=True,
+                 max_cores="none",
                  ):
         """
         Initialize NIRISS class
@@ -64,8 +65,13 @@ class NIRISS:
 
         run_bpfix : boolean
             Run Fourier bad pixel fix on cropped data
+
+        max_cores : string
+            Number of cores to use for the bad pixel fix: 'none', 'quarter',
+            'half' or 'all' of the available cores
         """
         self.run_bpfix = run_bpfix
+        self.max_cores = max_cores
         self.usebp = usebp
         self.chooseholes = chooseholes
         self.filt = filt
@@ -291,6 +297,7 @@ class NIRISS:
                 input_model.meta.instrument.filter,
                 self.pscale_mas,
                 self.nrm_model,
+                max_cores=self.max_cores,
             )
         else:
             log.info("Not running Fourier bad pixel fix")
@@ -0,0 +1,192 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from jwst.ami import bp_fix
+
+
+@pytest.fixture
+def band_limited_image():
+    """A smooth image with no power in the high spatial frequencies"""
+    shape = (32, 32)
+    rng = np.random.default_rng(42)
+    ft = np.zeros((shape[0], shape[1] // 2 + 1), dtype=complex)
+    low = [0, 1, 2, 3, -3, -2, -1]
+    for i in low:
+        for j in range(4):
+            ft[i, j] = rng.normal() + 1j * rng.normal()
+    image = np.fft.irfft2(ft, s=shape) + 10.0
+
+    # Fourier mask: everything outside the low-frequency support
+    fmas = np.ones(ft.shape, dtype=bool)
+    for i in low:
+        fmas[i, :4] = False
+    return image, fmas
+
+
+def test_fourier_corr(band_limited_image):
+    image, fmas = band_limited_image
+    pxdq = np.zeros(image.shape, dtype=bool)
+    pxdq[[5, 10, 20, 25], [7, 12, 3, 30]] = True
+
+    data = image.copy()
+    data[pxdq] = 1000.0
+    corrected = bp_fix.fourier_corr(data, pxdq, fmas)
+
+    assert np.allclose(corrected, image)
+    # input is not modified
+    assert np.all(data[pxdq] == 1000.0)
+
+
+def test_fourier_corr_cached(band_limited_image, monkeypatch):
+    image, fmas = band_limited_image
+    pxdq = np.zeros(image.shape, dtype=bool)
+    pxdq[3, 4] = True
+
+    calls = []
+    build_corrector = bp_fix._build_corrector
+
+    def counting_build_corrector(*args):
+        calls.append(args)
+        return build_corrector(*args)
+
+    monkeypatch.setattr(bp_fix, "_build_corrector", counting_build_corrector)
+
+    cache = {}
+    first = bp_fix.fourier_corr(image, pxdq, fmas, cache=cache)
+    second = bp_fix.fourier_corr(image, pxdq, fmas, cache=cache)
+    assert len(calls) == 1
+    assert np.array_equal(first, second)
+
+    # A new bad pixel mask replaces the cached matrix
+    pxdq[10, 11] = True
+    bp_fix.fourier_corr(image, pxdq, fmas, cache=cache)
+    assert len(calls) == 2
+    assert len(cache) == 1
+
+    # Without a cache the matrix is always recomputed
+    bp_fix.fourier_corr(image, pxdq, fmas)
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("size", [3, 5])
+def test_median_filter(size):
+    from scipy.ndimage import median_filter
+
+    rng = np.random.default_rng(0)
+    data = rng.normal(100.0, 10.0, (20, 21))
+
+    result = bp_fix._median_filter(data, size)
+
+    assert result.dtype == data.dtype
+    assert np.allclose(result, median_filter(data, size=size), rtol=1e-6)
+
+
+@pytest.fixture
+def nrm_model():
+    yy, xx = np.mgrid[-32:32, -32:32]
+    return SimpleNamespace(nrm=(np.hypot(xx, yy) < 30).astype(float))
+
+
+@pytest.mark.parametrize("npix", [40, 64])
+def test_calc_fourier_mask(nrm_model, npix):
+    pxsc_rad = 65.6 / 1000 * np.pi / (60 * 60 * 180)
+
+    fmas = bp_fix.calc_fourier_mask("F480M", npix, pxsc_rad, nrm_model.nrm)
+
+    # Mask in the centered full plane, sliced to the rfft2 half plane
+    cvis = bp_fix.calc_pupil_support("F480M", npix, pxsc_rad, nrm_model.nrm)
+    cvis /= np.max(cvis)
+    expected = np.fft.fftshift(cvis < 1e-3)[:, : npix // 2 + 1]
+
+    assert fmas.shape == (npix, npix // 2 + 1)
+    assert np.array_equal(fmas, expected)
+
+
+def test_get_fourier_mask_cached(nrm_model, monkeypatch):
+    calls = []
+    calc_fourier_mask = bp_fix.calc_fourier_mask
+
+    def counting_calc_fourier_mask(*args):
+        calls.append(args)
+        return calc_fourier_mask(*args)
+
+    monkeypatch.setattr(bp_fix, "calc_fourier_mask", counting_calc_fourier_mask)
+    monkeypatch.setattr(bp_fix, "_FOURIER_MASKS", {})
+    pxsc_rad = 65.6 / 1000 * np.pi / (60 * 60 * 180)
+
+    # Models without a file name are not cached
+    bp_fix._get_fourier_mask("F480M", 40, pxsc_rad, nrm_model)
+    bp_fix._get_fourier_mask("F480M", 40, pxsc_rad, nrm_model)
+    assert len(calls) == 2
+
+    nrm_model.meta = SimpleNamespace(filename="jwst_niriss_nrm_0001.fits")
+    first = bp_fix._get_fourier_mask("F480M", 40, pxsc_rad, nrm_model)
+    second = bp_fix._get_fourier_mask("F480M", 40, pxsc_rad, nrm_model)
+    assert len(calls) == 3
+    assert first is second
+    assert not first.flags.writeable
+
+    # A different filter needs a new mask
+    bp_fix._get_fourier_mask("F430M", 40, pxsc_rad, nrm_model)
+    assert len(calls) == 4
+
+
+@pytest.fixture
+def ami_cube():
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[:41, :41]
+    psf = 1.0e4 * np.exp(-((xx - 20) ** 2 + (yy - 20) ** 2) / 8.0)
+    data = np.stack([psf + rng.normal(0.0, 20.0, psf.shape) + 100.0 for _ in range(3)])
+    dq = np.zeros(data.shape, dtype=np.uint32)
+    for j, (y, x) in enumerate([(10, 12), (25, 5), (30, 33)]):
+        dq[j, y, x] = 1
+        data[j, y, x] = 5.0e4
+    return data, dq
+
+
+def test_fix_bad_pixels(ami_cube, nrm_model):
+    data, dq = ami_cube
+
+    fixed, pxdq = bp_fix.fix_bad_pixels(data.copy(), dq.copy(), "F480M", 65.6, nrm_model)
+
+    for j, (y, x) in enumerate([(10, 12), (25, 5), (30, 33)]):
+        assert pxdq[j, y, x]
+        assert fixed[j, y, x] < 1.0e3
+
+
+def test_fix_bad_pixels_multiprocessing(ami_cube, nrm_model, monkeypatch):
+    data, dq = ami_cube
+    monkeypatch.setattr(bp_fix.multiprocessing, "cpu_count", lambda: 2)
+
+    serial = bp_fix.fix_bad_pixels(data.copy(), dq.copy(), "F480M", 65.6, nrm_model)
+    parallel = bp_fix.fix_bad_pixels(
+        data.copy(), dq.copy(), "F480M", 65.6, nrm_model, max_cores="all"
+    )
+
+    assert np.allclose(serial[0], parallel[0])
+    assert np.array_equal(serial[1], parallel[1])
+
+
+def test_fix_bad_pixels_nan(ami_cube, nrm_model):
+    data, dq = ami_cube
+    data[1, 5, 5] = np.nan
+
+    fixed, pxdq = bp_fix.fix_bad_pixels(data, dq, "F480M", 65.6, nrm_model)
+
+    assert np.all(np.isfinite(fixed))
+    assert dq[1, 5, 5] == 1
+    # The NaN pixel is corrected, not left at zero
+    assert pxdq[1, 5, 5]
+    assert fixed[1, 5, 5] > 50.0
+
+
+def test_fourier_corr_no_bad_pixels(band_limited_image):
+    image, fmas = band_limited_image
+    pxdq = np.zeros(image.shape, dtype=bool)
+
+    corrected = bp_fix.fourier_corr(image, pxdq, fmas)
+
+    assert corrected is not image
+    assert np.array_equal(corrected, image)
@@ -1,6 +1,10 @@
 import copy
-from collections import OrderedDict
+from collections import defaultdict
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+import os
 import os.path as op
 import re
 import logging
@@ -8,6 +12,7 @@ import logging
 import numpy as np
 
 from asdf import AsdfFile
+from asdf.util import load_yaml
 from astropy.io import fits
 from stdatamodels import properties
 
@@ -22,6 +27,18 @@ __all__ = ['ModelContainer']
 _ONE_MB = 1 << 20
 RECOGNIZED_MEMBER_FIELDS = ['tweakreg_catalog', 'group_id']
 
+# Metadata used to assign a group_id by exposure, and the matching
+# primary header keywords.
+_GROUP_ID_PARAMETERS = {
+    'program_number': 'PROGRAM',
+    'observation_number': 'OBSERVTN',
+    'visit_number': 'VISIT',
+    'visit_group': 'VISITGRP',
+    'sequence_id': 'SEQ_ID',
+    'activity_id': 'ACT_ID',
+    'exposure_number': 'EXPOSURE',
+}
+
 # Configure logging
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
@@ -441,19 +458,43 @@ to supply custom catalogs.
         If a model already has ``model.meta.group_id`` set, that value will be
         used for grouping.
         """
-        unique_exposure_parameters = [
-            'program_number',
-            'observation_number',
-            'visit_number',
-            'visit_group',
-            'sequence_id',
-            'activity_id',
-            'exposure_number'
-        ]
+        return self._group_members().values()
+
+    @property
+    def group_names(self):
+        """
+        Return list of names for the JwstDataModel groups by exposure.
+        """
+        return list(self._group_members())
+
+    def _group_members(self):
+        """
+        Group the models by group_id in a single pass over the members.
+
+        Returns
+        -------
+        group_dict : dict
+            Models (or file names, for members kept on disk) keyed by
+            group_id, in order of first appearance.
+        """
+        # Models that would only be opened to look up their group_id and
+        # closed right away get it from the file headers instead.
+        if not self._save_open and not self._return_open:
+            filenames = [
+                model for model in self._models
+                if isinstance(model, str) and _is_fits(model)
+            ]
+            file_group_ids = dict(zip(filenames, _files_to_group_ids(filenames)))
+        else:
+            file_group_ids = {}
 
-        group_dict = OrderedDict()
+        group_dict = defaultdict(list)
         for i, model in enumerate(self._models):
-            params = []
+            if isinstance(model, str) and model in file_group_ids:
+                group_id = file_group_ids[model] or 'exposure{0:04d}'.format(i + 1)
+                group_dict[group_id].append(model)
+                continue
+
             if not self._save_open:
                 model = datamodel_open(model, memmap=self._memmap)
 
@@ -462,19 +503,12 @@ to supply custom catalogs.
                 group_id = model.meta.group_id
 
             else:
-                for param in unique_exposure_parameters:
-                    params.append(getattr(model.meta.observation, param))
+                params = [
+                    getattr(model.meta.observation, param)
+                    for param in _GROUP_ID_PARAMETERS
+                ]
                 try:
-                    group_id = (
-                        'jw' + '_'.join(
-                            [
-                                ''.join(params[:3]),
-                                ''.join(params[3:6]),
-                                params[6],
-                            ]
-                        )
-                    )
-                    model.meta.group_id = group_id
+                    model.meta.group_id = _group_id_from_params(params)
                 except TypeError:
                     model.meta.group_id = 'exposure{0:04d}'.format(i + 1)
 
@@ -484,22 +518,9 @@ to supply custom catalogs.
                 model.close()
                 model = self._models[i]
 
-            if group_id in group_dict:
-                group_dict[group_id].append(model)
-            else:
-                group_dict[group_id] = [model]
-
-        return group_dict.values()
+            group_dict[group_id].append(model)
 
-    @property
-    def group_names(self):
-        """
-        Return list of names for the JwstDataModel groups by exposure.
-        """
-        result = []
-        for group in self.models_grouped:
-            result.append(group[0].meta.group_id)
-        return result
+        return group_dict
 
     def close(self):
         """Close all datamodels."""
@@ -565,10 +586,31 @@ to supply custom catalogs.
         -------
         ind : list
             Indices of models in ModelContainer._models matching ``asn_exptype``.
+
+        Notes
+        -----
+        Members kept on disk are looked up in the association table by
+        file name rather than opened.
         """
+        asn_exptypes = {}
+        if any(isinstance(model, str) for model in self._models):
+            try:
+                members = self.meta.asn_table.products[0].members
+            except (AttributeError, IndexError):
+                members = []
+            for member in members:
+                asn_exptypes[op.basename(member.expname)] = member.exptype
+
         ind = []
         for i, model in enumerate(self._models):
-            if model.meta.asn.exptype.lower() == asn_exptype:
+            if isinstance(model, str) and op.basename(model) in asn_exptypes:
+                exptype = asn_exptypes[op.basename(model)]
+            elif isinstance(model, str):
+                with datamodel_open(model) as m:
+                    exptype = m.meta.asn.exptype
+            else:
+                exptype = model.meta.asn.exptype
+            if exptype.lower() == asn_exptype:
                 ind.append(i)
         return ind
 
@@ -588,7 +630,10 @@ to supply custom catalogs.
         self.overlap = 0 if overlap is None else overlap
         self.grow = 0
 
-        with datamodel_open(self._models[0]) as model:
+        # Only the shape and type are needed; memory map members kept on
+        # disk to avoid reading the data.
+        memmap = self._memmap or isinstance(self._models[0], str)
+        with datamodel_open(self._models[0], memmap=memmap) as model:
             imrows, imcols = model.data.shape
             data_item_size = model.data.itemsize
             data_item_type = model.data.dtype
@@ -619,7 +664,11 @@ to supply custom catalogs.
         self.imtype = data_item_type
 
     def get_sections(self):
-        """Iterator to return the sections from all members of the container."""
+        """Iterator to return the sections from all members of the container.
+
+        Members kept on disk as file names are memory mapped, so only the
+        rows of each section are read from the files.
+        """
 
         for k in range(self.n_sections):
             e1 = k * self.nbr
@@ -634,7 +683,10 @@ to supply custom catalogs.
             wht_list = np.empty((len(self._models), e2 - e1, self.imcols),
                                 dtype=self.imtype)
             for i, model in enumerate(self._models):
-                model = datamodel_open(model, memmap=self._memmap)
+                # Members kept on disk are only read from, one section at a
+                # time, so memory map them to avoid reading the full arrays
+                # for every section.
+                model = datamodel_open(model, memmap=self._memmap or isinstance(model, str))
 
                 data_list[i, :, :] = model.data[e1:e2].copy()
                 wht_list[i, :, :] = model.wht[e1:e2].copy()
@@ -644,6 +696,79 @@ to supply custom catalogs.
             yield (data_list, wht_list, (e1, e2))
 
 
+def _group_id_from_params(params):
+    """Build an exposure group_id from the ``_GROUP_ID_PARAMETERS`` values.
+
+    Raises
+    ------
+    TypeError
+        If any of the values is missing (`None`).
+    """
+    return 'jw' + '_'.join(
+        [
+            ''.join(params[:3]),
+            ''.join(params[3:6]),
+            params[6],
+        ]
+    )
+
+
+def _is_fits(filename):
+    return filename.lower().endswith(('.fits', '.fits.gz', '.fit'))
+
+
+def _files_to_group_ids(filenames):
+    """Read the group_id of several FITS model files.
+
+    Reading the headers is I/O bound, so the files are read concurrently.
+    """
+    if len(filenames) <= 1:
+        return [_file_to_group_id(filename) for filename in filenames]
+    with ThreadPoolExecutor(max_workers=min(32, len(filenames))) as executor:
+        return list(executor.map(_file_to_group_id, filenames))
+
+
+def _file_to_group_id(filename):
+    """Read the group_id of a FITS model file without opening the model.
+
+    A custom ``meta.group_id`` can only be stored in the ASDF extension,
+    so the (unparsed) ASDF tree is checked for one first; the exposure
+    parameters are then read from the primary header.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the FITS file.
+
+    Returns
+    -------
+    group_id : str or None
+        The group_id, or `None` if the exposure parameters are incomplete.
+    """
+    stat = os.stat(filename)
+    return _cached_file_to_group_id(filename, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=1024)
+def _cached_file_to_group_id(filename, mtime, size):
+    with fits.open(filename, memmap=True) as ff:
+        if 'ASDF' in ff:
+            asdf_bytes = ff['ASDF'].data.tobytes()
+            # Only parse the tree if it may contain a group_id.
+            if b'group_id' in asdf_bytes:
+                tree = load_yaml(BytesIO(asdf_bytes))
+                group_id = tree.get('meta', {}).get('group_id')
+                if group_id not in [None, '']:
+                    return group_id
+        header = ff[0].header
+        params = [header.get(keyword) for keyword in _GROUP_ID_PARAMETERS.values()]
+
+    try:
+        return _group_id_from_params(params)
+    except TypeError:
+        return None
+
+
 def make_file_with_index(file_path, idx):
     """Append an index to a filename
 
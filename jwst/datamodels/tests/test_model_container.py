@@ -2,6 +2,7 @@ import os
 import warnings
 from jwst.associations import load_as_asn
 
+import numpy as np
 import pytest
 
 from stdatamodels.jwst import datamodels
@@ -125,3 +126,74 @@ def test_group_id(tmp_path):
             model_droup_ids.add(m.meta.group_id)
 
     assert asn_group_ids == model_droup_ids
+
+
+@pytest.mark.parametrize("return_open", [True, False])
+def test_models_grouped_on_disk(tmp_path, return_open):
+    filenames = []
+    for i, (exposure_number, group_id) in enumerate(
+        [('1', None), ('1', None), ('2', None), ('1', 'custom')]
+    ):
+        model = datamodels.ImageModel((4, 4))
+        model.meta.observation.program_number = '0001'
+        model.meta.observation.observation_number = '1'
+        model.meta.observation.visit_number = '1'
+        model.meta.observation.visit_group = '1'
+        model.meta.observation.sequence_id = '01'
+        model.meta.observation.activity_id = '1'
+        model.meta.observation.exposure_number = exposure_number
+        if group_id is not None:
+            model.meta.group_id = group_id
+        filename = str(tmp_path / f'model{i}.fits')
+        model.save(filename)
+        filenames.append(filename)
+    # A file without exposure parameters gets its own group.
+    filename = str(tmp_path / 'model4.fits')
+    datamodels.ImageModel((4, 4)).save(filename)
+    filenames.append(filename)
+
+    container = ModelContainer(filenames, save_open=False, return_open=return_open)
+    groups = [list(group) for group in container.models_grouped]
+
+    assert [len(group) for group in groups] == [2, 1, 1, 1]
+    if return_open:
+        assert [group[0].meta.group_id for group in groups] == [
+            'jw000111_1011_1', 'jw000111_1011_2', 'custom', 'exposure0005'
+        ]
+    else:
+        assert groups[0] == filenames[:2]
+        assert groups[-1] == filenames[-1:]
+    assert container.group_names == [
+        'jw000111_1011_1', 'jw000111_1011_2', 'custom', 'exposure0005'
+    ]
+
+
+def test_model_container_ind_asn_exptype_on_disk():
+    asn_file_path, asn_file_name = os.path.split(ASN_FILE)
+    with pushdir(asn_file_path):
+        with ModelContainer(asn_file_name, save_open=False, return_open=False) as c:
+            assert all(isinstance(m, str) for m in c._models)
+            assert c.ind_asn_type('science') == [0, 1]
+
+
+def test_get_sections_on_disk(tmp_path):
+    filenames = []
+    for i in range(3):
+        model = datamodels.ImageModel((10, 8))
+        model.data[:] = np.arange(80, dtype=np.float32).reshape(10, 8) + i
+        model.wht = np.full((10, 8), i, dtype=np.float32)
+        filename = str(tmp_path / f'model{i}.fits')
+        model.save(filename)
+        filenames.append(filename)
+
+    container = ModelContainer(filenames, save_open=False, return_open=False)
+    container.set_buffer(8 * 4 * 3 / (1 << 20))
+
+    rows = []
+    for data, wht, (e1, e2) in container.get_sections():
+        assert data.shape == (3, e2 - e1, 8)
+        for i in range(3):
+            assert np.all(wht[i] == i)
+            assert np.array_equal(data[i] - i, np.arange(e1 * 8, e2 * 8).reshape(-1, 8))
+        rows.extend(range(e1, e2))
+    assert sorted(set(rows)) == list(range(10))
@@ -261,7 +261,7 @@ def split_container(container):
     return science, background
 
 
-def subtract_2d_background(source, background):
+def subtract_2d_background(source, background, inverse=False):
     """Subtract a 2D background
 
     Parameters
@@ -274,6 +274,9 @@ def subtract_2d_background(source, background):
         For a `~jwst.datamodels.ModelContainer`, the source and background
         models in the input containers must match one-to-one.
 
+    inverse : boolean
+        Add the background to the source instead of subtracting it.
+
     Returns
     -------
     `~jwst.datamodels.JwstDataModel`
@@ -285,12 +288,18 @@ def subtract_2d_background(source, background):
         # Handle individual NIRSpec FS, NIRSpec MOS
         if isinstance(model, datamodels.MultiSlitModel):
             for slit, slitbg in zip(result.slits, background.slits):
-                slit.data -= slitbg.data
+                if inverse:
+                    slit.data += slitbg.data
+                else:
+                    slit.data -= slitbg.data
                 slit.dq = np.bitwise_or(slit.dq, slitbg.dq)
 
         # Handle MIRI LRS, MIRI MRS and NIRSpec IFU
         elif isinstance(model, (datamodels.ImageModel, datamodels.IFUImageModel)):
-            result.data -= background.data
+            if inverse:
+                result.data += background.data
+            else:
+                result.data -= background.data
             result.dq = np.bitwise_or(result.dq, background.dq)
         else:
             # Shouldn't get here.
@@ -1,6 +1,7 @@
 import logging
 import warnings
 
+import numpy as np
 from stdatamodels.jwst import datamodels
 
 log = logging.getLogger(__name__)
@@ -31,19 +32,15 @@ def apply_master_background(source_model, bkg_model, inverse=False):
 
     if inverse:
         log.info('Adding master background from each MOS source slitlet')
-        bkg = bkg_model.copy()
-        for slit in bkg.slits:
-            slit.data *= -1.0
     else:
         log.info('Subtracting master background from each MOS source slitlet')
-        bkg = bkg_model
 
     # This does a one-to-one subtraction of the data in each background
     # slit from the data in the corresponding source slit (i.e. the
     # two MultiSlitModels must have matching numbers of slit instances).
     # This may be changed in the future to only do the subtraction from
     # a certain subset of source slits.
-    output_model = subtract_2d_background(source_model, bkg)
+    output_model = subtract_2d_background(source_model, bkg_model, inverse=inverse)
 
     return output_model
 
@@ -98,32 +95,26 @@ def create_background_from_multislit(input_model):
     log.info('Creating MOS master background from background slitlets')
 
     # Copy dedicated background slitlets to a temporary model
-    bkg_model = datamodels.MultiSlitModel()
-    bkg_model.update(input_model)
-    slits = []
-    for slit in input_model.slits:
-        if is_background_msa_slit(slit):
-            log.info(f'Using background slitlet {slit.source_name}')
-            slits.append(slit)
+    slits = [slit for slit in input_model.slits if is_background_msa_slit(slit)]
+    for slit in slits:
+        log.info(f'Using background slitlet {slit.source_name}')
 
     if len(slits) == 0:
         log.warning('No background slitlets found; skipping master bkg correction')
         return None
 
+    bkg_model = datamodels.MultiSlitModel()
+    bkg_model.update(input_model)
     bkg_model.slits.extend(slits)
 
     # Apply resample_spec and extract_1d to all background slitlets
     log.info('Applying resampling and 1D extraction to background slits')
-    resamp = resample_spec_step.ResampleSpecStep.call(bkg_model)
-    x1d = extract_1d_step.Extract1dStep.call(resamp)
-
-    # Call combine_1d to combine the 1D background spectra
-    log.info('Combining 1D background spectra into master background')
-    master_bkg = combine_1d_spectra(x1d, exptime_key='exposure_time')
-
-    del bkg_model
-    del resamp
-    del x1d
+    with bkg_model:
+        with resample_spec_step.ResampleSpecStep.call(bkg_model) as resamp:
+            with extract_1d_step.Extract1dStep.call(resamp) as x1d:
+                # Call combine_1d to combine the 1D background spectra
+                log.info('Combining 1D background spectra into master background')
+                master_bkg = combine_1d_spectra(x1d, exptime_key='exposure_time')
 
     return master_bkg
 
@@ -184,58 +175,32 @@ def correct_nrs_fs_bkg(input_model):
     """
     log.info('Applying point source updates to FS background')
 
-    # Try to load the appropriate pathloss correction arrays
-    if 'pathloss_point' in input_model.instance:
-        pl_point = getattr(input_model, 'pathloss_point')
-    else:
-        log.warning('pathloss_point array not found in input')
-        log.warning('Skipping background updates')
-        return input_model
-
-    if 'pathloss_uniform' in input_model.instance:
-        pl_uniform = getattr(input_model, 'pathloss_uniform')
-    else:
-        log.warning('pathloss_uniform array not found in input')
-        log.warning('Skipping background updates')
-        return input_model
-
-    # If processing the primary slit, we also need flatfield and
-    # photom correction arrays
-    if 'flatfield_point' in input_model.instance:
-        ff_point = getattr(input_model, 'flatfield_point')
-    else:
-        log.warning('flatfield_point array not found in input')
-        log.warning('Skipping background updates')
-        return input_model
-
-    if 'flatfield_uniform' in input_model.instance:
-        ff_uniform = getattr(input_model, 'flatfield_uniform')
-    else:
-        log.warning('flatfield_uniform array not found in input')
-        log.warning('Skipping background updates')
-        return input_model
-
-    if 'photom_point' in input_model.instance:
-        ph_point = getattr(input_model, 'photom_point')
-    else:
-        log.warning('photom_point array not found in input')
-        log.warning('Skipping background updates')
-        return input_model
-
-    if 'photom_uniform' in input_model.instance:
-        ph_uniform = getattr(input_model, 'photom_uniform')
-    else:
-        log.warning('photom_uniform array not found in input')
-        log.warning('Skipping background updates')
-        return input_model
+    # Try to load the appropriate pathloss correction arrays. If processing
+    # the primary slit, we also need flatfield and photom correction arrays.
+    names = ['pathloss_point', 'pathloss_uniform',
+             'flatfield_point', 'flatfield_uniform',
+             'photom_point', 'photom_uniform']
+    arrays = []
+    for name in names:
+        if name not in input_model.instance:
+            log.warning(f'{name} array not found in input')
+            log.warning('Skipping background updates')
+            return input_model
+        arrays.append(getattr(input_model, name))
+    pl_point, pl_uniform, ff_point, ff_uniform, ph_point, ph_uniform = arrays
 
     # Apply the corrections for the primary slit
     with warnings.catch_warnings():
         warnings.filterwarnings("ignore", "invalid value*", RuntimeWarning)
         warnings.filterwarnings("ignore", "divide by zero*", RuntimeWarning)
-        input_model.data *= (pl_uniform / pl_point) * \
-                            (ff_uniform / ff_point) * \
-                            (ph_point / ph_uniform)
+        # Collect the numerator and denominator of the combined ratio
+        # so that the correction needs a single divide.
+        correction = np.multiply(pl_uniform, ff_uniform)
+        correction *= ph_point
+        denominator = np.multiply(pl_point, ff_point)
+        denominator *= ph_uniform
+        correction /= denominator
+        input_model.data *= correction
 
     return input_model
 
@@ -254,7 +219,5 @@ def is_background_msa_slit(slit):
     bool
         True if the slit is background; False if it is not.
     """
-    if "BKG" in str(slit.source_name).upper():
-        return True
-    else:
-        return False
+    name = slit.source_name
+    return name is not None and 'BKG' in name.upper()
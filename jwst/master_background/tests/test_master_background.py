@@ -13,7 +13,9 @@ from jwst.master_background.create_master_bkg import create_background
 from jwst.master_background.master_background_step import (
     copy_background_to_surf_bright,
     split_container,
+    subtract_2d_background,
 )
+from jwst.master_background.nirspec_utils import apply_master_background
 
 
 @pytest.fixture(scope='module')
@@ -150,3 +152,63 @@ def test_split_container(tmp_path):
     assert bkg[0].meta.filename == "bar.fits"
     assert len(sci) == 1
     assert len(bkg) == 1
+
+
+def _multislit(value, dq):
+    model = datamodels.MultiSlitModel()
+    for _ in range(2):
+        slit = datamodels.SlitModel((5, 5))
+        slit.data[:] = value
+        slit.dq[:] = dq
+        model.slits.append(slit)
+    return model
+
+
+@pytest.mark.parametrize('inverse,expected', [(False, 1.5), (True, 4.5)])
+def test_subtract_2d_background_multislit(inverse, expected):
+    """Test background subtraction and addition for MultiSlitModels"""
+    source = _multislit(3.0, 1)
+    background = _multislit(1.5, 4)
+
+    result = subtract_2d_background(source, background, inverse=inverse)
+
+    for slit in result.slits:
+        assert np.all(slit.data == expected)
+        assert np.all(slit.dq == 5)
+    for slit in source.slits:
+        assert np.all(slit.data == 3.0)
+    for slit in background.slits:
+        assert np.all(slit.data == 1.5)
+
+
+@pytest.mark.parametrize('inverse,expected', [(False, 1.5), (True, 4.5)])
+def test_subtract_2d_background_image(inverse, expected):
+    """Test background subtraction and addition for ImageModels"""
+    source = datamodels.ImageModel((5, 5))
+    source.data[:] = 3.0
+    source.dq[:] = 1
+    background = datamodels.ImageModel((5, 5))
+    background.data[:] = 1.5
+    background.dq[:] = 4
+
+    result = subtract_2d_background(source, background, inverse=inverse)
+
+    assert np.all(result.data == expected)
+    assert np.all(result.dq == 5)
+    assert np.all(source.data == 3.0)
+    assert np.all(background.data == 1.5)
+
+
+def test_apply_master_background_inverse():
+    """Adding the master background back leaves the background model unchanged"""
+    source = _multislit(3.0, 1)
+    background = _multislit(1.5, 4)
+
+    result = apply_master_background(source, background, inverse=True)
+
+    for slit in result.slits:
+        assert np.all(slit.data == 4.5)
+        assert np.all(slit.dq == 5)
+    for slit in background.slits:
+        assert np.all(slit.data == 1.5)
+        assert np.all(slit.dq == 4)
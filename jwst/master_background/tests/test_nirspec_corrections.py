@@ -57,6 +57,20 @@ def test_fs_correction():
     assert np.allclose(corrected, result.data, rtol=1.e-7)
 
 
+def test_fs_correction_existence():
+    """Test the case where the input is missing a correction array"""
+
+    data = np.ones((5, 5))
+    input = datamodels.SlitModel(data=data.copy(),
+                                 pathloss_point=2 * data, pathloss_uniform=data,
+                                 flatfield_point=2 * data, flatfield_uniform=data,
+                                 photom_point=2 * data)
+    result = correct_nrs_fs_bkg(input)
+
+    assert result == input
+    assert np.all(result.data == data)
+
+
 @pytest.mark.parametrize('name,status',
                          [('BKG101', True), ('bkg101', True),
                           ('background_101', False), ('101', False),
@@ -1,3 +1,8 @@
+import importlib
+import pkgutil
+import subprocess
+import sys
+
 from stpipe.utilities import import_class
 
 from jwst.stpipe.integration import get_steps
@@ -48,7 +53,22 @@ def test_all_steps_in_step_all():
 
 
 def test_all_pipelines_in_pipeline_all():
+    # jwst.pipeline imports its pipelines lazily, load them all
+    for module_info in pkgutil.iter_modules(jwst.pipeline.__path__):
+        if module_info.name.startswith('calwebb_'):
+            importlib.import_module(f'jwst.pipeline.{module_info.name}')
+
     pipeline_names = set(_get_subclass_names(Pipeline))
     # MasterBackgroundMosStep is a pipeline that is treated like a step
     pipeline_names.remove('MasterBackgroundMosStep')
     assert set(jwst.pipeline.__all__) == pipeline_names
+
+
+def test_pipeline_import_is_lazy():
+    # Run in a fresh interpreter; other tests may already have imported the pipelines
+    code = (
+        "import sys, jwst.pipeline; "
+        "print(any(m.startswith('jwst.pipeline.calwebb_') for m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"